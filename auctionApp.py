@@ -1,8 +1,10 @@
 # auction_app.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sqlite3
 import os
+import sys
 import time
 import re
 import requests
@@ -10,11 +12,23 @@ import base64
 from io import BytesIO
 from PIL import Image, UnidentifiedImageError
 import random
+import uuid
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from photo_check import check_photo
 
 # ----------------- CONFIG -----------------
 DB_FILE = "auction.db"
 PLACEHOLDER = "assets/placeholder.png"
 BELL = "assets/bell.mp3"
+PHOTO_DIR = "photos"
+PHOTO_MANIFEST = os.path.join(PHOTO_DIR, "manifest.json")  # written by photo_check.py
+SEARCH_BACKEND = "memory"  # "memory" (trigram index) or "fts5" (SQLite full-text search, for very large rosters)
+SEARCH_FIELDS = ["full_name", "department", "role", "year"]
+EXPORT_DIR = "exports"  # artifacts produced by background jobs
+JOB_WORKERS = 2
 
 st.set_page_config(page_title="🏏 Cricket Auction App (DB)", layout="wide")
 st.sidebar.markdown("[🌐 GitHub](https://github.com/meteor4395)  |  🧑‍💻 Enhanced by **meteor**")
@@ -53,9 +67,28 @@ def init_db():
             full_name TEXT,
             team TEXT,
             price INTEGER,
-            ts DATETIME DEFAULT CURRENT_TIMESTAMP
+            ts DATETIME DEFAULT CURRENT_TIMESTAMP,
+            batch_id TEXT
         )
     """)
+    # jobs table (background exports / photo downloads)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT,
+            status TEXT DEFAULT 'queued',
+            progress REAL DEFAULT 0,
+            message TEXT,
+            artifact TEXT,
+            cancel_requested INTEGER DEFAULT 0,
+            created DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # older databases were created before bulk imports existed
+    result_cols = [r[1] for r in c.execute("PRAGMA table_info(results)").fetchall()]
+    if "batch_id" not in result_cols:
+        c.execute("ALTER TABLE results ADD COLUMN batch_id TEXT")
     conn.commit()
     conn.close()
 
@@ -85,6 +118,9 @@ def save_players_df_to_db(df: pd.DataFrame):
     )
     conn.commit()
     conn.close()
+    get_roster_store().invalidate()
+    if SEARCH_BACKEND == "fts5":
+        rebuild_players_fts()
 
 def load_players_df_from_db() -> pd.DataFrame:
     conn = sqlite3.connect(DB_FILE)
@@ -145,6 +181,152 @@ def add_result_to_db(player_id:int, full_name:str, team:str, price:int):
     conn.commit()
     conn.close()
 
+# ----------------- BULK OPERATIONS -----------------
+def read_bulk_results_file(uploaded_file) -> pd.DataFrame:
+    """Read a CSV/XLSX of (player_id, team, price) rows. Raises ValueError on missing columns."""
+    if uploaded_file.name.lower().endswith(".csv"):
+        df = pd.read_csv(uploaded_file)
+    else:
+        df = pd.read_excel(uploaded_file)
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    missing = [c for c in ["player_id", "team", "price"] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return df[["player_id", "team", "price"]].reset_index(drop=True)
+
+def validate_bulk_results(df: pd.DataFrame, players_df: pd.DataFrame, teams: list) -> pd.DataFrame:
+    """
+    Validate bulk rows against current players and team budgets.
+    Returns a report with columns: row, player_id, full_name, team, price, error
+    ('' when the row can be applied). Budgets are checked cumulatively per team
+    in file order, counting only rows that passed every other check.
+    """
+    out = df.copy()
+    out["row"] = out.index + 2  # spreadsheet row number (header is row 1)
+    out["player_id"] = pd.to_numeric(out["player_id"], errors="coerce")
+    out["price"] = pd.to_numeric(out["price"], errors="coerce")
+    out["team"] = out["team"].fillna("").astype(str).str.strip()
+    out["error"] = ""
+
+    def flag(mask, msg):
+        # keep only the first error found for a row
+        out.loc[mask & (out["error"] == ""), "error"] = msg
+
+    flag(out["player_id"].isna() | (out["player_id"] % 1 != 0), "invalid player_id")
+    flag(out["price"].isna() | (out["price"] < 0) | (out["price"] % 1 != 0), "invalid price")
+
+    if players_df.empty:
+        known = pd.DataFrame({"player_id": pd.Series(dtype="float64"),
+                              "full_name": pd.Series(dtype="object"),
+                              "auctioned": pd.Series(dtype="float64")})
+    else:
+        known = players_df[["player_id", "full_name", "auctioned"]].astype({"player_id": "float64"})
+    out = out.merge(known, on="player_id", how="left")
+    flag(out["auctioned"].isna(), "unknown player_id")
+    flag(out["auctioned"] == 1, "player already auctioned")
+    flag(out["player_id"].duplicated(keep="first"), "duplicate player_id in file")
+
+    team_names = [t["Team"] for t in teams]
+    flag(~out["team"].isin(team_names + ["UNSOLD"]), "unknown team")
+    flag((out["team"] == "UNSOLD") & (out["price"] != 0), "UNSOLD rows must have price 0")
+    flag((out["team"] != "UNSOLD") & (out["price"] <= 0), "sold rows need a price > 0")
+
+    budgets = {t["Team"]: t["Budget"] for t in teams}
+    flag(budget_overruns(out[out["error"] == ""], budgets).reindex(out.index, fill_value=False),
+         "exceeds team budget")
+
+    return out[["row", "player_id", "full_name", "team", "price", "error"]]
+
+def budget_overruns(df: pd.DataFrame, budgets: dict) -> pd.Series:
+    """
+    Walk rows per team in order and mark those the remaining budget can't cover.
+    Rejected rows don't count towards the team's spend. Returns a bool Series on df.index.
+    """
+    over = pd.Series(False, index=df.index)
+    for team, rows in df[df["team"] != "UNSOLD"].groupby("team", sort=False):
+        left = budgets.get(team, float("inf"))
+        for idx, price in rows["price"].items():
+            if price > left:
+                over[idx] = True
+            else:
+                left -= price
+    return over
+
+def apply_bulk_results(valid_df: pd.DataFrame):
+    """
+    Apply validated rows in a single transaction.
+    Players and budgets are re-checked inside the transaction, so rows made invalid
+    by a sale since validation (e.g. from another session) are skipped.
+    Returns (batch_id or None if nothing was applied, skipped rows with an error column).
+    """
+    batch_id = uuid.uuid4().hex[:8]
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    try:
+        # IMMEDIATE takes the write lock now, so nobody can sell between the re-check and the writes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            sold = {r[0] for r in conn.execute("SELECT player_id FROM players WHERE auctioned = 1")}
+            budgets = dict(conn.execute("SELECT team, budget FROM teams").fetchall())
+            rows = valid_df.copy()
+            rows["error"] = ""
+            rows.loc[rows["player_id"].astype(int).isin(sold), "error"] = "player sold since validation"
+            over = budget_overruns(rows[rows["error"] == ""], budgets).reindex(rows.index, fill_value=False)
+            rows.loc[over, "error"] = "exceeds team budget (changed since validation)"
+            apply_df = rows[rows["error"] == ""]
+
+            result_rows = [(int(r.player_id), r.full_name, r.team, int(r.price), batch_id)
+                           for r in apply_df.itertuples(index=False)]
+            spend = apply_df[apply_df["team"] != "UNSOLD"].groupby("team")["price"].sum()
+            c = conn.cursor()
+            c.executemany("INSERT INTO results (player_id, full_name, team, price, batch_id) VALUES (?, ?, ?, ?, ?)",
+                          result_rows)
+            c.executemany("UPDATE players SET auctioned = 1 WHERE player_id = ?",
+                          [(r[0],) for r in result_rows])
+            c.executemany("UPDATE teams SET spent = spent + ?, budget = budget - ? WHERE team = ?",
+                          [(int(p), int(p), team) for team, p in spend.items()])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return (batch_id if result_rows else None), rows[rows["error"] != ""]
+
+def load_bulk_batches() -> pd.DataFrame:
+    """List bulk-imported batches that are still in the results table."""
+    conn = sqlite3.connect(DB_FILE)
+    df = pd.read_sql("""
+        SELECT batch_id, COUNT(*) AS players, SUM(price) AS total, MIN(ts) AS imported_at
+        FROM results WHERE batch_id IS NOT NULL
+        GROUP BY batch_id ORDER BY imported_at DESC
+    """, conn)
+    conn.close()
+    return df
+
+def undo_bulk_batch(batch_id: str) -> int:
+    """Revert a bulk batch: refund teams, un-auction players, delete its results. Returns rows removed."""
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    try:
+        # read the batch under the write lock so two concurrent undos can't both refund it
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            batch_df = pd.read_sql("SELECT player_id, team, price FROM results WHERE batch_id = ?",
+                                   conn, params=(batch_id,))
+            refund = batch_df[batch_df["team"] != "UNSOLD"].groupby("team")["price"].sum()
+            c = conn.cursor()
+            c.executemany("UPDATE teams SET spent = spent - ?, budget = budget + ? WHERE team = ?",
+                          [(int(p), int(p), team) for team, p in refund.items()])
+            c.executemany("UPDATE players SET auctioned = 0 WHERE player_id = ?",
+                          [(int(pid),) for pid in batch_df["player_id"]])
+            c.execute("DELETE FROM results WHERE batch_id = ?", (batch_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return len(batch_df)
+
 # ----------------- EXTRA RESET FUNCTIONS -----------------
 def clear_results():
     """Delete only results table (auction summary)."""
@@ -188,6 +370,238 @@ def export_results_to_excel(results_df: pd.DataFrame, teams: list, filename="auc
                 columns={'player_id': 'Player ID', 'full_name': 'FULL NAME', 'price': 'Price'}
             ).to_excel(writer, index=False, sheet_name=team_name)
 
+# ----------------- SHARED ROSTER -----------------
+def compact_players_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Players table with small dtypes: categorical role/department/year, interned names, bool auctioned."""
+    if df.empty:
+        return df
+    out = pd.DataFrame({
+        'player_id': pd.to_numeric(df['player_id'], downcast='integer'),
+        'full_name': df['full_name'].map(lambda s: sys.intern(s) if isinstance(s, str) else s),
+        'department': df['department'].astype('category'),
+        'year': df['year'].astype('category'),
+        'role': df['role'].astype('category'),
+        'photo': df['photo'],
+        'auctioned': df['auctioned'].to_numpy() == 1,
+    })
+    return out
+
+class RosterStore:
+    """
+    Process-wide, read-only copy of the players table shared by every browser session.
+    sync() is cheap when nothing changed (PRAGMA data_version), and after a sale only
+    the auctioned flags are re-read; the other columns are reused without copying.
+    Frames returned by players() are shared: never modify them in place.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        self.data_version = None
+        self.df = pd.DataFrame()
+        self.generation = 0  # bumped on every full reload, so derived indexes know to rebuild
+
+    def invalidate(self):
+        """Force a full reload on the next sync (player list replaced)."""
+        with self.lock:
+            self.data_version = None
+
+    def sync(self):
+        with self.lock:
+            try:
+                version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+                if version == self.data_version:
+                    return
+                if self.data_version is None or self.df.empty:
+                    self.df = compact_players_df(pd.read_sql("SELECT * FROM players ORDER BY player_id", self.conn))
+                    self.generation += 1
+                else:
+                    flags = pd.read_sql("SELECT player_id, auctioned FROM players ORDER BY player_id", self.conn)
+                    if np.array_equal(flags['player_id'].to_numpy(), self.df['player_id'].to_numpy()):
+                        cols = {c: self.df[c] for c in self.df.columns}
+                        cols['auctioned'] = flags['auctioned'].to_numpy() == 1
+                        self.df = pd.DataFrame(cols, copy=False)
+                    else:
+                        self.df = compact_players_df(pd.read_sql("SELECT * FROM players ORDER BY player_id", self.conn))
+                        self.generation += 1
+            except Exception:
+                # e.g. "database is locked": keep the last good frame and retry on the next sync
+                return
+            self.data_version = version
+
+    def players(self) -> pd.DataFrame:
+        return self.df
+
+    def snapshot(self) -> tuple:
+        """(generation, players frame) read together, for indexes built on top of the roster."""
+        with self.lock:
+            return self.generation, self.df
+
+    def unauctioned_ids(self) -> np.ndarray:
+        df = self.df
+        if df.empty:
+            return np.empty(0, dtype=np.int64)
+        return df['player_id'].to_numpy()[~df['auctioned'].to_numpy()]
+
+    def row(self, player_id: int):
+        """One player as a dict (like a row of load_players_df_from_db()), or None."""
+        df = self.df
+        if df.empty:
+            return None
+        ids = df['player_id'].to_numpy()
+        pos = int(np.searchsorted(ids, player_id))
+        if pos >= len(ids) or ids[pos] != player_id:
+            return None
+        rec = df.iloc[pos].to_dict()
+        rec['player_id'] = int(rec['player_id'])
+        rec['auctioned'] = int(rec['auctioned'])
+        return rec
+
+@st.cache_resource(show_spinner=False)
+def get_roster_store() -> RosterStore:
+    return RosterStore()
+
+# ----------------- PLAYER SEARCH -----------------
+def make_trigrams(text: str) -> set:
+    """Lowercased character trigrams of every word, padded so short words still match."""
+    grams = set()
+    for word in str(text).lower().split():
+        w = f"  {word} "
+        grams.update(w[i:i + 3] for i in range(len(w) - 2))
+    return grams
+
+class PlayerSearchIndex:
+    """
+    In-memory trigram index over the players table (SEARCH_FIELDS).
+    Postings are numpy arrays of row positions, so a query is one concatenate +
+    bincount over the matching postings. Auctioned players are kept in the
+    index and masked out at query time, so sales never need a rebuild.
+    The index is one (generation, postings, player_ids, auctioned) tuple that is only
+    ever replaced as a whole, so searches from other sessions never mix two versions.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.state = (None, {}, np.empty(0, dtype=np.int64), np.empty(0, dtype=bool))
+
+    @staticmethod
+    def build(generation, players_df: pd.DataFrame) -> tuple:
+        postings = defaultdict(list)
+        cols = players_df[SEARCH_FIELDS].astype(object).fillna("").astype(str)
+        texts = cols[SEARCH_FIELDS[0]].str.cat([cols[f] for f in SEARCH_FIELDS[1:]], sep=" ")
+        for pos, text in enumerate(texts):
+            for g in make_trigrams(text):
+                postings[g].append(pos)
+        return (generation,
+                {g: np.array(p, dtype=np.int32) for g, p in postings.items()},
+                players_df['player_id'].to_numpy(dtype=np.int64),
+                players_df['auctioned'].to_numpy() == 1)
+
+    def sync(self, generation, players_df: pd.DataFrame):
+        """
+        Rebuild when the roster was reloaded (new RosterStore generation, e.g. a re-upload
+        that keeps ids 1..N but changes names); otherwise just refresh the auctioned flags.
+        """
+        with self.lock:
+            built_for, postings, player_ids, _ = self.state
+            if generation != built_for or len(player_ids) != len(players_df):
+                self.state = self.build(generation, players_df)
+            else:
+                self.state = (built_for, postings, player_ids, players_df['auctioned'].to_numpy() == 1)
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3, include_auctioned: bool = False) -> list:
+        """
+        Return player_ids ranked by the share of query trigrams they contain.
+        Queries under 3 characters match words starting with them, in player_id order
+        (same as search_players_fts).
+        """
+        _, postings, player_ids, auctioned = self.state
+        s = " ".join(str(query).lower().split())
+        if 0 < len(s) < 3:
+            # "  r" / " ra" only occur at the start of a word
+            pos = postings.get(("  " + s)[-3:], np.empty(0, dtype=np.int32))
+            if not include_auctioned:
+                pos = pos[~auctioned[pos]]
+            return [int(player_ids[i]) for i in np.sort(pos)[:limit]]
+        q_grams = make_trigrams(query)
+        hits = [postings[g] for g in q_grams if g in postings]
+        if not hits:
+            return []
+        scores = np.bincount(np.concatenate(hits), minlength=len(player_ids)) / len(q_grams)
+        if not include_auctioned:
+            scores[auctioned] = 0
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [int(player_ids[i]) for i in top if scores[i] >= min_score]
+
+@st.cache_resource(show_spinner=False)
+def get_player_index() -> PlayerSearchIndex:
+    """One search index per server process, shared by every browser session."""
+    return PlayerSearchIndex()
+
+def rebuild_players_fts():
+    """(Re)create the FTS5 table used when SEARCH_BACKEND == 'fts5'. Needs SQLite >= 3.34 (trigram tokenizer)."""
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS players_fts")
+            conn.execute("CREATE VIRTUAL TABLE players_fts USING fts5("
+                         "player_id UNINDEXED, full_name, department, role, year, tokenize='trigram')")
+            conn.execute("INSERT INTO players_fts (player_id, full_name, department, role, year) "
+                         "SELECT player_id, full_name, department, role, year FROM players")
+    finally:
+        conn.close()
+
+def search_players_fts(query: str, limit: int = 10) -> list:
+    """FTS5 search: any query trigram may match, ranked by bm25. Auctioned status is read live from players."""
+    s = " ".join(str(query).lower().split())
+    if not s:
+        return []
+    if len(s) < 3:
+        # the trigram tokenizer can't match under 3 characters: match word starts, like the memory index
+        pattern = "% " + s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conn = sqlite3.connect(DB_FILE)
+        try:
+            rows = conn.execute("""
+                SELECT player_id FROM players
+                WHERE auctioned = 0
+                  AND ' ' || ifnull(full_name, '') || ' ' || ifnull(department, '') || ' '
+                      || ifnull(role, '') || ' ' || ifnull(year, '') LIKE ? ESCAPE '\\'
+                ORDER BY player_id LIMIT ?
+            """, (pattern, limit)).fetchall()
+        finally:
+            conn.close()
+        return [int(r[0]) for r in rows]
+    grams = {s[i:i + 3] for i in range(len(s) - 2)}
+    match = " OR ".join('"' + g.replace('"', '""') + '"' for g in grams)
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        rows = conn.execute("""
+            SELECT f.player_id FROM players_fts f JOIN players p ON p.player_id = f.player_id
+            WHERE players_fts MATCH ? AND p.auctioned = 0
+            ORDER BY f.rank LIMIT ?
+        """, (match, limit)).fetchall()
+    finally:
+        conn.close()
+    return [int(r[0]) for r in rows]
+
+def search_players(query: str, roster: "RosterStore", limit: int = 10) -> list:
+    """Search unauctioned players with the configured backend. Falls back to memory if FTS5 is unavailable."""
+    if SEARCH_BACKEND == "fts5":
+        try:
+            return search_players_fts(query, limit)
+        except sqlite3.OperationalError as e:
+            # only a missing table needs a rebuild; anything else (e.g. "database is locked")
+            # falls through to the in-memory index for this query
+            if "no such table: players_fts" in str(e):
+                try:
+                    rebuild_players_fts()  # DB from an older version
+                    return search_players_fts(query, limit)
+                except sqlite3.OperationalError:
+                    pass
+    index = get_player_index()
+    index.sync(*roster.snapshot())
+    return index.search(query, limit=limit)
+
 # ----------------- DRIVE IMAGE HELPERS -----------------
 def extract_drive_file_id(link: str):
     """Extract Google Drive file id from various link formats or return None."""
@@ -217,14 +631,57 @@ def make_drive_download_url(fid: str):
     # export=download tends to return raw bytes
     return f"https://drive.google.com/uc?export=download&id={fid}"
 
-@st.cache_data(show_spinner=False)
-def download_image_bytes(url: str):
-    """Download bytes for an image URL (cached). Returns bytes or raises."""
+def fetch_url_bytes(url: str):
+    """Download bytes for a URL (uncached, safe to call from background jobs). Returns (bytes, content type) or raises."""
     headers = {"User-Agent": "Mozilla/5.0"}
     r = requests.get(url, headers=headers, timeout=12)
     r.raise_for_status()
     return r.content, r.headers.get("Content-Type", "")
 
+@st.cache_data(show_spinner=False)
+def download_image_bytes(url: str):
+    """Download bytes for an image URL (cached). Returns bytes or raises."""
+    return fetch_url_bytes(url)
+
+@st.cache_data(show_spinner=False)
+def read_photo_manifest(mtime: float) -> dict:
+    """Parse the photo manifest (cached per file modification time)."""
+    with open(PHOTO_MANIFEST) as f:
+        return json.load(f).get("photos", {})
+
+def local_photo_path(player_id):
+    """
+    Local photo path for a player (photos/photo_{player_id-1}.jpg) or None.
+    When photo_check.py has written a manifest, only photos it verified are used,
+    so images are not re-validated at render time. A file whose size differs from
+    the manifest was replaced after the check and counts as unverified.
+    """
+    if not player_id:
+        return None
+    path = os.path.join(PHOTO_DIR, f"photo_{max(int(player_id)-1, 0)}.jpg")
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(PHOTO_MANIFEST):
+        try:
+            entry = read_photo_manifest(os.path.getmtime(PHOTO_MANIFEST)).get(str(int(player_id)))
+        except (OSError, ValueError):
+            entry = {"status": "ok"}  # unreadable manifest: behave as if there was none
+        if not entry or entry.get("status") != "ok":
+            return None
+        if "bytes" in entry and os.path.getsize(path) != entry["bytes"]:
+            return None
+    return path
+
+def players_missing_from_manifest(players_df: pd.DataFrame) -> int:
+    """Number of players without a photo_check.py manifest entry (0 when there is no manifest)."""
+    if players_df.empty or not os.path.exists(PHOTO_MANIFEST):
+        return 0
+    try:
+        known = read_photo_manifest(os.path.getmtime(PHOTO_MANIFEST))
+    except (OSError, ValueError):
+        return 0
+    return int((~players_df['player_id'].astype(str).isin(list(known))).sum())
+
 def show_player_image(photo_link, caption=""):
     """Display player image from local photos folder. Fallback to placeholder if not found."""
     placeholder_exists = os.path.exists(PLACEHOLDER)
@@ -261,6 +718,159 @@ def show_player_image(photo_link, caption=""):
     if caption:
         st.caption(caption)
 
+# ----------------- BACKGROUND JOBS -----------------
+class JobCancelled(Exception):
+    pass
+
+def update_job(job_id: str, **fields):
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    with conn:
+        conn.execute(f"UPDATE jobs SET {cols}, updated = CURRENT_TIMESTAMP WHERE id = ?",
+                     (*fields.values(), job_id))
+    conn.close()
+
+class JobContext:
+    """Handed to job functions so they can report progress and notice cancellation."""
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def progress(self, fraction: float, message: str = ""):
+        """Record progress (0..1). Raises JobCancelled if the user asked to cancel."""
+        conn = sqlite3.connect(DB_FILE, timeout=10)
+        with conn:
+            conn.execute("UPDATE jobs SET progress = ?, message = ?, updated = CURRENT_TIMESTAMP WHERE id = ?",
+                         (float(fraction), message, self.job_id))
+            cancel = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (self.job_id,)).fetchone()[0]
+        conn.close()
+        if cancel:
+            raise JobCancelled()
+
+def run_job(job_id: str, fn, args):
+    """Worker-thread wrapper: runs fn(job, *args) and stores the outcome in the jobs table."""
+    job = JobContext(job_id)
+    try:
+        job.progress(0, "starting")
+        update_job(job_id, status="running")
+        artifact = fn(job, *args)
+        update_job(job_id, status="done", progress=1.0, artifact=artifact)
+    except JobCancelled:
+        update_job(job_id, status="cancelled", message="cancelled")
+    except Exception as e:
+        update_job(job_id, status="failed", message=str(e))
+
+@st.cache_resource(show_spinner=False)
+def get_job_pool() -> ThreadPoolExecutor:
+    """One worker pool per server process. Jobs left running by a previous process are marked failed."""
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    with conn:
+        conn.execute("UPDATE jobs SET status = 'failed', message = 'interrupted (app restarted)' "
+                     "WHERE status IN ('queued', 'running')")
+    conn.close()
+    return ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="auction-job")
+
+def submit_job(kind: str, fn, *args) -> str:
+    """Queue fn(job, *args) on the worker pool. fn returns an artifact path (or None)."""
+    pool = get_job_pool()
+    job_id = uuid.uuid4().hex[:8]
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    with conn:
+        conn.execute("INSERT INTO jobs (id, kind) VALUES (?, ?)", (job_id, kind))
+    conn.close()
+    pool.submit(run_job, job_id, fn, args)
+    return job_id
+
+def cancel_job(job_id: str):
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    with conn:
+        conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')",
+                     (job_id,))
+    conn.close()
+
+def load_jobs(limit: int = 8) -> pd.DataFrame:
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    df = pd.read_sql("SELECT * FROM jobs ORDER BY created DESC, rowid DESC LIMIT ?", conn, params=(limit,))
+    conn.close()
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def read_artifact(path: str, mtime: float) -> bytes:
+    """Artifact bytes for download buttons (cached so polling doesn't re-read the file)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+def export_excel_job(job: JobContext):
+    job.progress(0.1, "loading results")
+    results_df = load_results_from_db()
+    teams = load_teams_from_db()
+    job.progress(0.3, "writing workbook")
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    filename = os.path.join(EXPORT_DIR, f"auction_results_{job.job_id}.xlsx")
+    export_results_to_excel(results_df, teams, filename=filename)
+    return filename
+
+def merge_photo_manifest(entries: list):
+    """Add/replace photo_check entries in the existing manifest (atomic rewrite)."""
+    with open(PHOTO_MANIFEST) as f:
+        manifest = json.load(f)
+    manifest.setdefault("photos", {}).update({str(e["player_id"]): e for e in entries})
+    tmp = PHOTO_MANIFEST + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, PHOTO_MANIFEST)
+
+def fetch_photos_job(job: JobContext):
+    """
+    Download Drive photos for players without a usable local photo (missing, or
+    marked bad in the manifest). Each download is verified/normalized with
+    photo_check.check_photo and recorded in the manifest when one exists.
+    """
+    players = load_players_df_from_db()
+    if players.empty:
+        raise ValueError("no players uploaded")
+    has_manifest = os.path.exists(PHOTO_MANIFEST)
+    known = {}
+    if has_manifest:
+        with open(PHOTO_MANIFEST) as f:
+            known = json.load(f).get("photos", {})
+    todo = [(int(pid), link) for pid, link in zip(players['player_id'], players['photo'])
+            if extract_drive_file_id(link)
+            and (not os.path.exists(os.path.join(PHOTO_DIR, f"photo_{int(pid)-1}.jpg"))
+                 or known.get(str(int(pid)), {}).get("status") == "bad")]
+    os.makedirs(PHOTO_DIR, exist_ok=True)
+    saved, failed = 0, 0
+    checked = []
+    try:
+        for i, (pid, link) in enumerate(todo):
+            job.progress(i / len(todo), f"{i}/{len(todo)} photos")
+            try:
+                data, ctype = fetch_url_bytes(make_drive_download_url(extract_drive_file_id(link)))
+            except requests.RequestException:
+                failed += 1
+                continue
+            # Drive sends an HTML page when the file isn't publicly shared
+            if ctype.startswith("text/html"):
+                failed += 1
+                continue
+            dest = os.path.join(PHOTO_DIR, f"photo_{pid-1}.jpg")
+            with open(dest + ".download", "wb") as f:
+                f.write(data)
+            os.replace(dest + ".download", dest)
+            entry = check_photo(dest)
+            checked.append(entry)
+            if entry["status"] == "ok":
+                saved += 1
+            else:
+                failed += 1
+                if not has_manifest:
+                    os.remove(dest)  # without a manifest the app would show the broken file
+    finally:
+        # record whatever was checked, also when the job is cancelled halfway
+        if has_manifest and checked:
+            merge_photo_manifest(checked)
+    update_job(job.job_id, message=f"saved {saved}, failed {failed}")
+    return None
+
 # ----------------- SOUND -----------------
 def play_sound():
     if os.path.exists(BELL):
@@ -283,6 +893,10 @@ def play_sound():
 
 # ----------------- APP INIT -----------------
 init_db()
+get_job_pool()  # also marks jobs interrupted by a server restart as failed
+# one shared players table for all sessions, refreshed only when the DB changed
+roster = get_roster_store()
+roster.sync()
 if "auctioned_ids" not in st.session_state:
     st.session_state.auctioned_ids = set()
 
@@ -296,8 +910,7 @@ with st.sidebar:
 
 # Load persisted data into session_state on first run
 if "db_loaded" not in st.session_state:
-    # load players and teams into session state for UI convenience
-    st.session_state.players_df = load_players_df_from_db()
+    # load teams into session state for UI convenience (players live in the shared roster)
     st.session_state.teams = load_teams_from_db()
     st.session_state.auction_results = load_results_from_db().to_dict(orient="records") if not load_results_from_db().empty else []
     st.session_state.current_player = None
@@ -307,23 +920,48 @@ if "db_loaded" not in st.session_state:
 # ----------------- FIX: Unique random player picker -----------------
 def pick_unique_random_player():
     """Pick a random unauctioned player not seen before."""
-    fresh_players = load_players_df_from_db()
-    unauctioned_df = fresh_players[fresh_players['auctioned'] == 0]
+    roster.sync()
+    unauctioned_ids = roster.unauctioned_ids()
 
     # ✅ FIX: Only filter by auctioned flag, not session tracker if DB is fresh
-    if unauctioned_df.empty:
+    if len(unauctioned_ids) == 0:
         return None
 
     # Exclude players already chosen in this session (extra safeguard)
-    unauctioned_df = unauctioned_df[~unauctioned_df['player_id'].isin(st.session_state.auctioned_ids)]
+    unauctioned_ids = unauctioned_ids[~np.isin(unauctioned_ids, list(st.session_state.auctioned_ids))]
 
-    if unauctioned_df.empty:
+    if len(unauctioned_ids) == 0:
         return None
 
-    picked = unauctioned_df.sample(1).iloc[0].to_dict()
+    picked = roster.row(unauctioned_ids[random.randrange(len(unauctioned_ids))])
     st.session_state.auctioned_ids.add(picked['player_id'])  # track this ID
     return picked
 
+# ----------------- UI: Background jobs (sidebar) -----------------
+@st.fragment(run_every=2)
+def jobs_panel():
+    """Polls the jobs table every 2s without rerunning the rest of the page."""
+    jobs_df = load_jobs()
+    if jobs_df.empty:
+        st.caption("No background jobs yet.")
+        return
+    for job in jobs_df.itertuples():
+        st.markdown(f"**{job.kind}** `{job.id}` · {job.status}")
+        if job.status in ("queued", "running"):
+            st.progress(min(max(float(job.progress or 0), 0.0), 1.0), text=job.message or None)
+            if st.button("✖ Cancel", key=f"cancel_job_{job.id}", disabled=bool(job.cancel_requested)):
+                cancel_job(job.id)
+        elif job.status == "done" and job.artifact and os.path.exists(job.artifact):
+            st.download_button("⬇️ Download", read_artifact(job.artifact, os.path.getmtime(job.artifact)),
+                               file_name=os.path.basename(job.artifact), key=f"dl_job_{job.id}")
+        elif job.message:
+            st.caption(job.message)
+
+with st.sidebar:
+    st.markdown("---")
+    st.subheader("⏳ Background Jobs")
+    jobs_panel()
+
 # ----------------- UI: Tabs -----------------
 tabs = st.tabs(["📅 Upload Players", "👥 Team Setup", "🎯 Auction Panel", "📊 Summary & Export"])
 
@@ -343,17 +981,24 @@ with tabs[0]:
             else:
                 # Save into DB
                 save_players_df_to_db(df)
-                st.session_state.players_df = load_players_df_from_db()
+                roster.sync()
                 st.success("✅ Players uploaded and saved to database.")
-                st.dataframe(st.session_state.players_df.head(20))
+                st.dataframe(roster.players().head(20))
         except Exception as e:
             st.error(f"Error reading file: {e}")
     else:
-        if st.session_state.players_df is None or st.session_state.players_df.empty:
+        if roster.players().empty:
             st.info("Upload an Excel file with columns: FULL NAME, DEPARTMENT, YEAR, PLAYER ROLE, UPLOAD YOUR PHOTO")
         else:
             st.info("Players already loaded from DB.")
-            st.dataframe(st.session_state.players_df.head(10))
+            st.dataframe(roster.players().head(10))
+            missing_photos = players_missing_from_manifest(roster.players())
+            if missing_photos:
+                st.warning(f"⚠️ {missing_photos} players are not in photos/manifest.json, their photos stay hidden "
+                           "until you re-run photo_check.py.")
+            if st.button("📸 Fetch Drive Photos (background)"):
+                job_id = submit_job("fetch_photos", fetch_photos_job)
+                st.success(f"Photo download started as job {job_id}, see the sidebar for progress.")
 
 # 2️⃣ Team Setup
 with tabs[1]:
@@ -396,11 +1041,10 @@ with tabs[1]:
 # 3️⃣ Auction Panel
 with tabs[2]:
     st.title("🎯 Auction Panel")
-    players_df = load_players_df_from_db()
+    players_df = roster.players()
     if players_df.empty:
         st.warning("⚠️ Upload the player list first in the 'Upload Players' tab.")
     else:
-        unauctioned_df = players_df[players_df['auctioned'] == 0]
         col_left, col_right = st.columns([1, 2])
 
         # Show currently selected player if any
@@ -414,8 +1058,8 @@ with tabs[2]:
                 img_path = None
 
                 # Try local photo
-                candidate = os.path.join("photos", f"photo_{max(int(pid)-1,0)}.jpg") if pid else None
-                if candidate and os.path.exists(candidate):
+                candidate = local_photo_path(pid)
+                if candidate:
                     img_path = candidate
                 elif os.path.exists(PLACEHOLDER):
                     img_path = PLACEHOLDER
@@ -474,8 +1118,6 @@ with tabs[2]:
                                 # ✅ Commit sale to DB
                                 add_result_to_db(int(player['player_id']), player['full_name'],
                                                  selected_team, int(sold_price))
-                                # update session_state players_df
-                                st.session_state.players_df = load_players_df_from_db()
                                 # update teams in session from DB
                                 st.session_state.teams = load_teams_from_db()
                                 st.session_state.current_player = None
@@ -486,7 +1128,6 @@ with tabs[2]:
 
                 if unsold_btn:
                     add_result_to_db(int(player['player_id']), player['full_name'], "UNSOLD", 0)
-                    st.session_state.players_df = load_players_df_from_db()
                     st.session_state.current_player = None
                     st.session_state.start_time = None
                     st.info("🚫 Player marked as UNSOLD.")
@@ -538,12 +1179,78 @@ with tabs[2]:
                 st.session_state.start_time = time.time()
                 st.rerun()
 
+        # 🔹 Find a specific player (fuzzy search over name, department, role, year)
+        search_q = st.text_input("🔎 Find Player", placeholder="name, department, role or year", key="player_search")
+        if search_q.strip():
+            hit_ids = search_players(search_q, roster)
+            if not hit_ids:
+                st.info("No matching unauctioned players.")
+            else:
+                hits = {pid: rec for pid in hit_ids if (rec := roster.row(pid))}
+                chosen_id = st.selectbox(
+                    "Matches", list(hits),
+                    format_func=lambda pid: (f"{hits[pid]['full_name']} | {hits[pid]['department']} | "
+                                             f"{hits[pid]['role']} | {hits[pid]['year']} (ID {pid})")
+                )
+                if st.button("📥 Load Player", disabled=pick_disabled):
+                    st.session_state.current_player = hits[chosen_id]
+                    st.session_state.start_time = time.time()
+                    st.session_state.auctioned_ids.add(chosen_id)
+                    st.rerun()
+
 # 4️⃣ Summary & Export
 with tabs[3]:
     st.title("📊 Auction Summary & Export")
 
+    # 🔹 Bulk import of offline results (CSV/XLSX with player_id, team, price)
+    with st.expander("📥 Bulk Import Results"):
+        bulk_file = st.file_uploader("Upload results file (csv/xlsx) with columns: player_id, team, price",
+                                     type=["csv", "xlsx"], key="bulk_file")
+        if bulk_file is None:
+            st.session_state.pop("bulk_report", None)
+        else:
+            try:
+                # validate once per uploaded file, not on every rerun of the app
+                bulk_file_id = getattr(bulk_file, "file_id", bulk_file.name)
+                cached = st.session_state.get("bulk_report")
+                if cached is None or cached[0] != bulk_file_id:
+                    cached = (bulk_file_id, validate_bulk_results(read_bulk_results_file(bulk_file),
+                                                                  load_players_df_from_db(), load_teams_from_db()))
+                    st.session_state.bulk_report = cached
+                bulk_report = cached[1]
+                bulk_ok = bulk_report[bulk_report["error"] == ""]
+                bulk_bad = bulk_report[bulk_report["error"] != ""]
+                st.write(f"✅ Valid rows: {len(bulk_ok)}  |  ❌ Rows with errors: {len(bulk_bad)}")
+                if not bulk_bad.empty:
+                    st.dataframe(bulk_bad)
+                    st.download_button("⬇️ Download Error Report (CSV)", bulk_bad.to_csv(index=False).encode(),
+                                       file_name="bulk_import_errors.csv")
+                if st.button(f"✅ Apply {len(bulk_ok)} Valid Rows", disabled=bulk_ok.empty):
+                    batch_id, skipped = apply_bulk_results(bulk_ok)
+                    st.session_state.pop("bulk_report", None)
+                    st.session_state.teams = load_teams_from_db()
+                    if not skipped.empty:
+                        st.warning(f"⚠️ {len(skipped)} rows changed since validation and were skipped.")
+                        st.dataframe(skipped)
+                    if batch_id:
+                        st.success(f"🎉 Applied {len(bulk_ok) - len(skipped)} results as batch {batch_id}.")
+                    if skipped.empty:
+                        st.rerun()
+            except Exception as e:
+                st.error(f"Error reading file: {e}")
+
+        batches_df = load_bulk_batches()
+        if not batches_df.empty:
+            st.markdown("**Imported batches**")
+            st.dataframe(batches_df)
+            undo_batch = st.selectbox("Batch to undo", batches_df["batch_id"].tolist(), key="undo_batch")
+            if st.button("↩️ Undo Batch"):
+                removed = undo_bulk_batch(undo_batch)
+                st.session_state.teams = load_teams_from_db()
+                st.success(f"↩️ Removed {removed} results from batch {undo_batch}.")
+                st.rerun()
+
     results_df = load_results_from_db()
-    teams_db = load_teams_from_db()
 
     if results_df.empty:
         st.warning("⚠️ No auction results yet.")
@@ -555,19 +1262,14 @@ with tabs[3]:
         csv_bytes = results_df.to_csv(index=False).encode('utf-8')
         st.download_button("⬇️ Download Results CSV", csv_bytes, file_name="auction_results.csv")
 
-        # Excel export combining team sheets
-        excel_file = "auction_results.xlsx"
-        try:
-            export_results_to_excel(results_df, teams_db, filename=excel_file)
-            with open(excel_file, "rb") as f:
-                st.download_button("⬇️ Download Combined Excel", f.read(), file_name=excel_file)
-        except Exception as e:
-            st.error(f"Could not create Excel file: {e}")
+        # Excel export combining team sheets (built in the background, download from the sidebar)
+        if st.button("📦 Prepare Combined Excel"):
+            job_id = submit_job("export_excel", export_excel_job)
+            st.success(f"Excel export started as job {job_id}, download it from the sidebar when done.")
 
     # Unsold players export: build from players table
-    players_df = load_players_df_from_db()
+    players_df = roster.players()
     if not players_df.empty:
-        unsold_df = players_df[players_df['auctioned'] == 1].copy()
         # Find those marked UNSOLD in results
         res_df = results_df
         if not res_df.empty:
@@ -602,8 +1304,8 @@ with tabs[3]:
                 if 'full_name' in res_local.columns:
                     res_local = res_local.rename(columns={'full_name': 'full_name_res'})
 
-                players_subset = players_df[['player_id', 'full_name', 'department', 'year', 'role', 'photo']] if not players_df.empty else pd.DataFrame()
-                merged = res_local.merge(players_subset, on='player_id', how='left')
+                # merge against the shared roster directly; only the team's rows are materialized
+                merged = res_local.merge(players_df, on='player_id', how='left') if not players_df.empty else res_local
 
                 # ---- 5x4 Grid Layout ----
                 max_cols = 5
@@ -636,14 +1338,12 @@ with tabs[3]:
                                 if os.path.exists(photo_field):
                                     img_path = photo_field
                                 else:
-                                    candidate = os.path.join("photos", photo_field)
+                                    candidate = os.path.join(PHOTO_DIR, photo_field)
                                     if os.path.exists(candidate):
                                         img_path = candidate
 
                             if img_path is None:
-                                candidate2 = os.path.join("photos", f"photo_{max(pid-1,0)}.jpg")
-                                if os.path.exists(candidate2):
-                                    img_path = candidate2
+                                img_path = local_photo_path(pid)
 
                             if img_path is None and os.path.exists(PLACEHOLDER):
                                 img_path = PLACEHOLDER
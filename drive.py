@@ -32,7 +32,8 @@ def extract_file_id(url):
 def download_file_from_google_drive(file_id, dest_path):
     URL = "https://drive.google.com/uc?export=download&id={}".format(file_id)
     response = requests.get(URL, stream=True)
-    if response.status_code == 200:
+    # Drive answers with an HTML page (virus-scan warning / sign-in) when it can't serve the file
+    if response.status_code == 200 and not response.headers.get("Content-Type", "").startswith("text/html"):
         with open(dest_path, "wb") as f:
             for chunk in response.iter_content(1024):
                 f.write(chunk)
@@ -69,3 +70,4 @@ df['downloaded_photo'] = downloaded_paths
 df.to_excel(OUTPUT_FILE, index=False)
 
 print("✅ Download complete! Updated file saved as", OUTPUT_FILE)
+print("ℹ️ Copy the photos into the app's photos folder and run photo_check.py to verify them.")
@@ -0,0 +1,115 @@
+import os
+import re
+import json
+import time
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# HEIC/HEIF support is optional: pip install pillow-heif
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:
+    pass
+
+# ==== CONFIGURATION ====
+PHOTO_FOLDER = "photos"                            # folder with photo_{player_id-1}.* files
+MANIFEST_FILE = os.path.join(PHOTO_FOLDER, "manifest.json")
+JPEG_QUALITY = 90
+WORKERS = None                                     # None = one process per CPU core
+
+PHOTO_NAME = re.compile(r"^photo_(\d+)\.(jpg|jpeg|png|heic|heif|webp|bmp|gif)$", re.IGNORECASE)
+
+
+def check_photo(path):
+    """
+    Verify one photo and normalize it to a plain RGB JPEG at photo_{n}.jpg:
+    EXIF orientation applied, metadata stripped. Files that are already clean
+    JPEGs are left untouched. Returns a manifest entry (dict).
+    """
+    name = os.path.basename(path)
+    index = int(PHOTO_NAME.match(name).group(1))
+    entry = {"player_id": index + 1, "source": name, "file": f"photo_{index}.jpg"}
+    dest = os.path.join(os.path.dirname(path), entry["file"])
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        head = data[:512].lstrip().lower()
+        if head.startswith(b"<!doctype html") or head.startswith(b"<html"):
+            raise ValueError("HTML page instead of an image (Drive file not shared publicly?)")
+
+        # verify() catches truncated/corrupt files but leaves the image unusable, so reopen after
+        with Image.open(BytesIO(data)) as img:
+            img.verify()
+        with Image.open(BytesIO(data)) as img:
+            img.load()
+            fmt = img.format
+            needs_rewrite = (
+                fmt != "JPEG"
+                or img.mode != "RGB"
+                or bool(img.getexif())
+                or any(k in img.info for k in ("exif", "icc_profile", "xmp", "comment"))
+                or not name.endswith(".jpg")
+            )
+            if needs_rewrite:
+                out = ImageOps.exif_transpose(img).convert("RGB")
+                # a fresh image carries no EXIF/ICC/XMP from the source
+                clean = Image.new("RGB", out.size)
+                clean.paste(out)
+                tmp = dest + ".tmp"
+                clean.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True)
+                os.replace(tmp, dest)
+                # samefile: photo_1.JPG and photo_1.jpg are one file on case-insensitive filesystems
+                if os.path.exists(path) and not os.path.samefile(dest, path):
+                    os.remove(path)
+                size = clean.size
+            else:
+                size = img.size
+        entry.update(status="ok", format=fmt, converted=needs_rewrite,
+                     width=size[0], height=size[1], bytes=os.path.getsize(dest))
+    except UnidentifiedImageError:
+        entry.update(status="bad", error=f"UnidentifiedImageError: cannot identify image file {name}")
+    except Exception as e:
+        # corrupt files surface as OSError, SyntaxError (bad PNG CRC), EOFError, struct.error, ...
+        entry.update(status="bad", error=f"{type(e).__name__}: {e}")
+    return entry
+
+
+def main():
+    if not os.path.isdir(PHOTO_FOLDER):
+        raise SystemExit(f"Photo folder '{PHOTO_FOLDER}' not found.")
+
+    # one file per player: prefer an existing .jpg over other formats with the same index
+    by_index = {}
+    for name in sorted(os.listdir(PHOTO_FOLDER)):
+        m = PHOTO_NAME.match(name)
+        if not m:
+            continue
+        index = int(m.group(1))
+        if index not in by_index or name.lower().endswith(".jpg"):
+            by_index[index] = os.path.join(PHOTO_FOLDER, name)
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+        entries = list(pool.map(check_photo, [by_index[i] for i in sorted(by_index)], chunksize=8))
+
+    manifest = {
+        "generated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "photos": {str(e["player_id"]): e for e in entries},
+    }
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, MANIFEST_FILE)
+
+    bad = [e for e in entries if e["status"] != "ok"]
+    converted = sum(1 for e in entries if e.get("converted"))
+    print(f"✅ Checked {len(entries)} photos in {time.time() - start:.1f}s "
+          f"({converted} normalized, {len(bad)} bad). Manifest saved as {MANIFEST_FILE}")
+    for e in bad:
+        print(f"❌ player_id {e['player_id']} ({e['source']}): {e['error']}")
+
+
+if __name__ == "__main__":
+    main()